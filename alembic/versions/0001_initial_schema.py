@@ -0,0 +1,187 @@
+"""Initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "certifications",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_table(
+        "directors",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_table(
+        "genres",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_table(
+        "stars",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_table(
+        "user_groups",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.Enum("USER", "MODERATOR", "ADMIN", name="usergroupenum"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name"),
+    )
+    op.create_table(
+        "movies",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("uuid", sa.UUID(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("time", sa.Integer(), nullable=False),
+        sa.Column("imdb", sa.Float(), nullable=False),
+        sa.Column("votes", sa.Integer(), nullable=False),
+        sa.Column("meta_score", sa.Float(), nullable=True),
+        sa.Column("gross", sa.Float(), nullable=True),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("price", sa.DECIMAL(precision=10, scale=2), nullable=False),
+        sa.Column("certification_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["certification_id"], ["certifications.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name", "year", "time", name="unique_movie_constraint"),
+        sa.UniqueConstraint("uuid"),
+    )
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("hashed_password", sa.String(length=255), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("group_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["group_id"], ["user_groups.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_users_email"), "users", ["email"], unique=True)
+    op.create_table(
+        "activation_tokens",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("token", sa.String(length=64), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("token"),
+        sa.UniqueConstraint("user_id"),
+    )
+    op.create_table(
+        "movie_directors",
+        sa.Column("movie_id", sa.Integer(), nullable=False),
+        sa.Column("director_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["director_id"], ["directors.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["movie_id"], ["movies.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("movie_id", "director_id"),
+    )
+    op.create_table(
+        "movie_genres",
+        sa.Column("movie_id", sa.Integer(), nullable=False),
+        sa.Column("genre_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["genre_id"], ["genres.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["movie_id"], ["movies.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("movie_id", "genre_id"),
+    )
+    op.create_table(
+        "movie_stars",
+        sa.Column("movie_id", sa.Integer(), nullable=False),
+        sa.Column("star_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["movie_id"], ["movies.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["star_id"], ["stars.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("movie_id", "star_id"),
+    )
+    op.create_table(
+        "password_reset_tokens",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("token", sa.String(length=64), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("token"),
+        sa.UniqueConstraint("user_id"),
+    )
+    op.create_table(
+        "refresh_tokens",
+        sa.Column("token", sa.String(length=512), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("token"),
+    )
+    op.create_table(
+        "user_favorites",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("movie_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["movie_id"], ["movies.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "movie_id"),
+    )
+    op.create_table(
+        "user_profiles",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("first_name", sa.String(length=255), nullable=True),
+        sa.Column("last_name", sa.String(length=255), nullable=True),
+        sa.Column("avatar", sa.String(length=255), nullable=True),
+        sa.Column("gender", sa.Enum("MAN", "WOMAN", name="genderenum"), nullable=True),
+        sa.Column("date_of_birth", sa.Date(), nullable=True),
+        sa.Column("info", sa.String(length=255), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_profiles")
+    op.drop_table("user_favorites")
+    op.drop_table("refresh_tokens")
+    op.drop_table("password_reset_tokens")
+    op.drop_table("movie_stars")
+    op.drop_table("movie_genres")
+    op.drop_table("movie_directors")
+    op.drop_table("activation_tokens")
+    op.drop_index(op.f("ix_users_email"), table_name="users")
+    op.drop_table("users")
+    op.drop_table("movies")
+    op.drop_table("user_groups")
+    op.drop_table("stars")
+    op.drop_table("genres")
+    op.drop_table("directors")
+    op.drop_table("certifications")
+    sa.Enum(name="genderenum").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="usergroupenum").drop(op.get_bind(), checkfirst=True)
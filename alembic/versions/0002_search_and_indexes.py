@@ -0,0 +1,165 @@
+"""Movie full-text search, case-insensitive emails and supporting indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Mirrors the DDL attached to the models in database/models/movies.py.
+SEARCH_VECTOR_UPDATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION movies_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce((
+            SELECT string_agg(s.name, ' ')
+            FROM stars s JOIN movie_stars ms ON ms.star_id = s.id
+            WHERE ms.movie_id = NEW.id
+        ), '')), 'B') ||
+        setweight(to_tsvector('english', coalesce((
+            SELECT string_agg(d.name, ' ')
+            FROM directors d JOIN movie_directors md ON md.director_id = d.id
+            WHERE md.movie_id = NEW.id
+        ), '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+"""
+
+SEARCH_VECTOR_TOUCH_FUNCTION = """
+CREATE OR REPLACE FUNCTION movies_search_vector_touch() RETURNS trigger AS $$
+BEGIN
+    UPDATE movies SET name = name
+    WHERE id = CASE WHEN TG_OP = 'DELETE' THEN OLD.movie_id ELSE NEW.movie_id END;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+SEARCH_VECTOR_TOUCH_PERSON_FUNCTION = """
+CREATE OR REPLACE FUNCTION movies_search_vector_touch_person() RETURNS trigger AS $$
+BEGIN
+    IF TG_TABLE_NAME = 'stars' THEN
+        UPDATE movies SET name = name
+        WHERE id IN (SELECT movie_id FROM movie_stars WHERE star_id = NEW.id);
+    ELSE
+        UPDATE movies SET name = name
+        WHERE id IN (SELECT movie_id FROM movie_directors WHERE director_id = NEW.id);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+SEARCH_VECTOR_TRIGGERS = {
+    "movies_search_vector_trigger": (
+        "movies",
+        "BEFORE INSERT OR UPDATE OF name, description ON movies "
+        "FOR EACH ROW EXECUTE FUNCTION movies_search_vector_update()",
+    ),
+    "movie_stars_search_vector_trigger": (
+        "movie_stars",
+        "AFTER INSERT OR DELETE ON movie_stars "
+        "FOR EACH ROW EXECUTE FUNCTION movies_search_vector_touch()",
+    ),
+    "movie_directors_search_vector_trigger": (
+        "movie_directors",
+        "AFTER INSERT OR DELETE ON movie_directors "
+        "FOR EACH ROW EXECUTE FUNCTION movies_search_vector_touch()",
+    ),
+    "stars_search_vector_trigger": (
+        "stars",
+        "AFTER UPDATE OF name ON stars "
+        "FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name) "
+        "EXECUTE FUNCTION movies_search_vector_touch_person()",
+    ),
+    "directors_search_vector_trigger": (
+        "directors",
+        "AFTER UPDATE OF name ON directors "
+        "FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name) "
+        "EXECUTE FUNCTION movies_search_vector_touch_person()",
+    ),
+}
+
+# name -> (table, columns); built CONCURRENTLY so writes are not blocked on large tables.
+QUERY_INDEXES = {
+    "ix_movies_year_desc": ("movies", [sa.text("year DESC")]),
+    "ix_movies_imdb_desc": ("movies", [sa.text("imdb DESC")]),
+    "ix_movies_price_desc": ("movies", [sa.text("price DESC")]),
+    "ix_movies_votes_desc": ("movies", [sa.text("votes DESC")]),
+    "ix_movies_imdb_year": ("movies", ["imdb", "year"]),
+    "ix_movie_genres_genre_id": ("movie_genres", ["genre_id"]),
+    "ix_activation_tokens_expires_at": ("activation_tokens", ["expires_at"]),
+    "ix_password_reset_tokens_expires_at": ("password_reset_tokens", ["expires_at"]),
+}
+
+
+def upgrade() -> None:
+    # Emails are compared case-insensitively. Existing addresses that differ only by case
+    # must be merged before this runs, or the unique ix_users_email rebuild fails.
+    op.execute("CREATE EXTENSION IF NOT EXISTS citext")
+    op.alter_column(
+        "users",
+        "email",
+        type_=postgresql.CITEXT(),
+        existing_type=sa.String(length=255),
+        existing_nullable=False,
+    )
+
+    op.add_column("movies", sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True))
+
+    op.execute(SEARCH_VECTOR_UPDATE_FUNCTION)
+    op.execute(SEARCH_VECTOR_TOUCH_FUNCTION)
+    op.execute(SEARCH_VECTOR_TOUCH_PERSON_FUNCTION)
+    for trigger_name, (_table, definition) in SEARCH_VECTOR_TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {trigger_name} {definition}")
+
+    # Fire the movies trigger once for the existing rows.
+    op.execute("UPDATE movies SET name = name")
+    op.create_index("movies_search_gin", "movies", ["search_vector"], postgresql_using="gin")
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        for index_name, (table, columns) in QUERY_INDEXES.items():
+            op.create_index(
+                index_name, table, columns, postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, (table, _columns) in QUERY_INDEXES.items():
+            op.drop_index(
+                index_name, table_name=table, postgresql_concurrently=True, if_exists=True
+            )
+
+    op.drop_index("movies_search_gin", table_name="movies")
+    for trigger_name, (table, _definition) in SEARCH_VECTOR_TRIGGERS.items():
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger_name} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS movies_search_vector_touch_person()")
+    op.execute("DROP FUNCTION IF EXISTS movies_search_vector_touch()")
+    op.execute("DROP FUNCTION IF EXISTS movies_search_vector_update()")
+    op.drop_column("movies", "search_vector")
+
+    op.alter_column(
+        "users",
+        "email",
+        type_=sa.String(length=255),
+        existing_type=postgresql.CITEXT(),
+        existing_nullable=False,
+    )
@@ -12,6 +12,17 @@ celery_app = Celery(
     backend=settings.CELERY_RESULT_BACKEND,
 )
 
+celery_app.conf.update(
+    broker_pool_limit=10,
+    broker_connection_retry_on_startup=True,
+    broker_transport_options={"max_connections": 10, "visibility_timeout": 3600},
+    redis_max_connections=10,
+)
+
+celery_app.conf.task_routes = {
+    "tasks.email.*": {"queue": "email"},
+}
+
 celery_app.conf.beat_schedule = {
     "cleanup-expired-tokens-every-hour": {
         "task": "tasks.cleanup.cleanup_expired_tokens",
@@ -19,4 +30,4 @@ celery_app.conf.beat_schedule = {
     }
 }
 
-celery_app.autodiscover_tasks(["tasks"])
\ No newline at end of file
+celery_app.autodiscover_tasks(["tasks.cleanup", "tasks.email"], related_name=None)
\ No newline at end of file
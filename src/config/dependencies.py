@@ -1,4 +1,5 @@
 import os
+from functools import lru_cache
 
 from fastapi import Depends
 
@@ -7,6 +8,7 @@ from security.interfaces import JWTAuthManagerInterface
 from security.token_manager import JWTAuthManager
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> BaseAppSettings:
     """
     Retrieve the application settings based on the current environment.
@@ -15,6 +17,9 @@ def get_settings() -> BaseAppSettings:
     and returns a corresponding settings instance. If the environment is 'testing', it returns an instance
     of TestingSettings; otherwise, it returns an instance of Settings.
 
+    The settings are built once per process and cached; call `get_settings.cache_clear()` after
+    changing the environment (e.g. in tests) to rebuild them.
+
     Returns:
         BaseAppSettings: The settings instance appropriate for the current environment.
     """
@@ -1,4 +1,3 @@
-import os
 from pathlib import Path
 
 from pydantic_settings import BaseSettings
@@ -9,24 +8,32 @@ class BaseAppSettings(BaseSettings):
     PATH_TO_DB: str = str(BASE_DIR / "database" / "source" / "theater.db")
     PATH_TO_MOVIES_CSV: str = str(BASE_DIR / "database" / "seed_data" / "imdb_movies.csv")
     LOGIN_TIME_DAYS: int = 7
-    FRONTEND_URL: str = os.getenv("FRONTEND_URL", "http://localhost:3000")
-    SMTP_HOST: str | None = os.getenv("SMTP_HOST")
-    SMTP_PORT: int = int(os.getenv("SMTP_PORT", "587"))
-    SMTP_USERNAME: str | None = os.getenv("SMTP_USERNAME")
-    SMTP_PASSWORD: str | None = os.getenv("SMTP_PASSWORD")
-    SMTP_FROM: str = os.getenv("SMTP_FROM", "no-reply@example.com")
-    SMTP_USE_TLS: bool = os.getenv("SMTP_USE_TLS", "1") in {"1", "true", "True"}
-    CELERY_BROKER_URL: str = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
-    CELERY_RESULT_BACKEND: str = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/1")
+    FRONTEND_URL: str = "http://localhost:3000"
+    SMTP_HOST: str | None = None
+    SMTP_PORT: int = 587
+    SMTP_USERNAME: str | None = None
+    SMTP_PASSWORD: str | None = None
+    SMTP_FROM: str = "no-reply@example.com"
+    SMTP_USE_TLS: bool = True
+    CELERY_BROKER_URL: str = "redis://localhost:6379/0"
+    CELERY_RESULT_BACKEND: str = "redis://localhost:6379/1"
+    REDIS_URL: str = "redis://localhost:6379/2"
+    LOGIN_RATE_LIMIT_ATTEMPTS: int = 10
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS: int = 60
 
 
 class Settings(BaseAppSettings):
-    POSTGRES_USER: str = os.getenv("POSTGRES_USER", "test_user")
-    POSTGRES_PASSWORD: str = os.getenv("POSTGRES_PASSWORD", "test_password")
-    POSTGRES_HOST: str = os.getenv("POSTGRES_HOST", "test_host")
-    POSTGRES_DB_PORT: int = int(os.getenv("POSTGRES_DB_PORT", 5432))
-    POSTGRES_DB: str = os.getenv("POSTGRES_DB", "test_db")
+    POSTGRES_USER: str = "test_user"
+    POSTGRES_PASSWORD: str = "test_password"
+    POSTGRES_HOST: str = "test_host"
+    POSTGRES_DB_PORT: int = 5432
+    POSTGRES_DB: str = "test_db"
+    POSTGRES_POOL_SIZE: int = 20
+    POSTGRES_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT: int = 30
+    POSTGRES_POOL_RECYCLE: int = 1800
+    POSTGRES_USE_PGBOUNCER: bool = False
 
-    SECRET_KEY_ACCESS: str = os.getenv("SECRET_KEY_ACCESS", "CHANGE_ME_ACCESS")
-    SECRET_KEY_REFRESH: str = os.getenv("SECRET_KEY_REFRESH", "CHANGE_ME_REFRESH")
-    JWT_SIGNING_ALGORITHM: str = os.getenv("JWT_SIGNING_ALGORITHM", "HS256")
\ No newline at end of file
+    SECRET_KEY_ACCESS: str = "CHANGE_ME_ACCESS"
+    SECRET_KEY_REFRESH: str = "CHANGE_ME_REFRESH"
+    JWT_SIGNING_ALGORITHM: str = "HS256"
\ No newline at end of file
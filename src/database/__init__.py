@@ -6,8 +6,7 @@ from database.models.accounts import (
     UserGroupModel,
     UserGroupEnum,
     ActivationTokenModel,
-    PasswordResetTokenModel,
-    RefreshTokenModel
+    PasswordResetTokenModel
 )
 from database.models.movies import (
     MovieModel,
@@ -17,6 +16,7 @@ from database.models.movies import (
     DirectorModel
 )
 from database.session_sqlite import reset_sqlite_database as reset_database
+from database.session_redis import get_redis
 from database.validators import accounts as accounts_validators
 
 environment = os.getenv("ENVIRONMENT", "developing")
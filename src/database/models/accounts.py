@@ -3,7 +3,8 @@ import enum
 from typing import List, Optional
 
 from pydantic import EmailStr
-from sqlalchemy import Boolean, Date, DateTime, Enum, ForeignKey, Integer, String, UniqueConstraint, func
+from sqlalchemy import DDL, Boolean, Date, DateTime, Enum, ForeignKey, Integer, String, UniqueConstraint, event, func
+from sqlalchemy.dialects.postgresql import CITEXT
 from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from database.models.base import Base
@@ -40,7 +41,9 @@ class UserModel(Base):
     __tablename__ = "users"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    email: Mapped[EmailStr] = mapped_column(String(255), unique=True, nullable=False, index=True)
+    email: Mapped[EmailStr] = mapped_column(
+        CITEXT().with_variant(String(255), "sqlite"), unique=True, nullable=False, index=True
+    )
     _hashed_password: Mapped[str] = mapped_column("hashed_password", String(255), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
@@ -65,12 +68,6 @@ class UserModel(Base):
         cascade="all, delete-orphan"
     )
 
-    refresh_tokens: Mapped[List["RefreshTokenModel"]] = relationship(
-        "RefreshTokenModel",
-        back_populates="user",
-        cascade="all, delete-orphan"
-    )
-
     profile: Mapped[Optional["UserProfileModel"]] = relationship(
         "UserProfileModel",
         back_populates="user",
@@ -112,6 +109,13 @@ class UserModel(Base):
         return validators.validate_email(value.lower())
 
 
+event.listen(
+    UserModel.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS citext").execute_if(dialect="postgresql")
+)
+
+
 class UserProfileModel(Base):
     __tablename__ = "user_profiles"
 
@@ -154,6 +158,7 @@ class TokenBaseModel(Base):
     expires_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
+        index=True,
         default=lambda: datetime.now(timezone.utc) + timedelta(days=1)
     )
 
@@ -178,20 +183,3 @@ class PasswordResetTokenModel(TokenBaseModel):
 
     def __repr__(self):
         return f"<PasswordResetTokenModel(id={self.id}, token={self.token}, expires_at={self.expires_at})>"
-
-
-class RefreshTokenModel(TokenBaseModel):
-    __tablename__ = "refresh_tokens"
-
-    user: Mapped["UserModel"] = relationship("UserModel", back_populates="refresh_tokens")
-    token: Mapped[str] = mapped_column(
-        String(512),
-        unique=True,
-        nullable=False,
-        default=generate_secure_token
-    )
-
-    @classmethod
-    def create(cls, user_id: int, days_valid: int, token: str) -> "RefreshTokenModel":
-        expires_at = datetime.now(timezone.utc) + timedelta(days=days_valid)
-        return cls(user_id=user_id, token=token, expires_at=expires_at)
\ No newline at end of file
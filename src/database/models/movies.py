@@ -2,6 +2,7 @@ import uuid
 from typing import Optional, List
 
 from sqlalchemy import (
+    Boolean,
     String,
     Integer,
     Float,
@@ -11,8 +12,15 @@ from sqlalchemy import (
     Table,
     Column,
     UniqueConstraint,
+    Index,
+    DDL,
+    event,
+    func,
+    or_,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
 from sqlalchemy.orm import (
     Mapped,
     mapped_column,
@@ -129,6 +137,11 @@ class MovieModel(Base):
     description: Mapped[str] = mapped_column(Text, nullable=False)
     price: Mapped[float] = mapped_column(DECIMAL(10, 2), nullable=False)
 
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR().with_variant(Text, "sqlite"),
+        deferred=True
+    )
+
     certification_id: Mapped[int] = mapped_column(
         ForeignKey("certifications.id"),
         nullable=False
@@ -161,7 +174,151 @@ class MovieModel(Base):
 
     __table_args__ = (
         UniqueConstraint("name", "year", "time", name="unique_movie_constraint"),
+        Index("movies_search_gin", "search_vector", postgresql_using="gin"),
     )
 
     def __repr__(self):
-        return f"<Movie(name='{self.name}', year={self.year}, time={self.time})>"
\ No newline at end of file
+        return f"<Movie(name='{self.name}', year={self.year}, time={self.time})>"
+
+
+# Every movie list is ordered by one of these columns, descending.
+Index("ix_movies_year_desc", MovieModel.year.desc())
+Index("ix_movies_imdb_desc", MovieModel.imdb.desc())
+Index("ix_movies_price_desc", MovieModel.price.desc())
+Index("ix_movies_votes_desc", MovieModel.votes.desc())
+Index("ix_movies_imdb_year", MovieModel.imdb, MovieModel.year)
+Index("ix_movie_genres_genre_id", movie_genres.c.genre_id)
+
+
+# search_vector is maintained by PostgreSQL itself: the movies trigger rebuilds it from
+# name, description and the attached star/director names, the association table
+# triggers touch the parent movie so the vector follows (un)linked stars and directors,
+# and renaming a star or director touches every movie it is linked to.
+# create_all only covers fresh (SQLite/test) databases; PostgreSQL gets the same objects
+# from the Alembic migrations, which must be kept in step with this DDL.
+_search_vector_ddl = {
+    "movies": (
+        DDL(
+            """
+            CREATE OR REPLACE FUNCTION movies_search_vector_update() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector :=
+                    setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
+                    setweight(to_tsvector('english', coalesce((
+                        SELECT string_agg(s.name, ' ')
+                        FROM stars s JOIN movie_stars ms ON ms.star_id = s.id
+                        WHERE ms.movie_id = NEW.id
+                    ), '')), 'B') ||
+                    setweight(to_tsvector('english', coalesce((
+                        SELECT string_agg(d.name, ' ')
+                        FROM directors d JOIN movie_directors md ON md.director_id = d.id
+                        WHERE md.movie_id = NEW.id
+                    ), '')), 'B') ||
+                    setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+            """
+        ),
+        DDL(
+            """
+            CREATE OR REPLACE FUNCTION movies_search_vector_touch() RETURNS trigger AS $$
+            BEGIN
+                UPDATE movies SET name = name
+                WHERE id = CASE WHEN TG_OP = 'DELETE' THEN OLD.movie_id ELSE NEW.movie_id END;
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql
+            """
+        ),
+        DDL(
+            """
+            CREATE OR REPLACE FUNCTION movies_search_vector_touch_person() RETURNS trigger AS $$
+            BEGIN
+                IF TG_TABLE_NAME = 'stars' THEN
+                    UPDATE movies SET name = name
+                    WHERE id IN (SELECT movie_id FROM movie_stars WHERE star_id = NEW.id);
+                ELSE
+                    UPDATE movies SET name = name
+                    WHERE id IN (SELECT movie_id FROM movie_directors WHERE director_id = NEW.id);
+                END IF;
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql
+            """
+        ),
+        DDL(
+            "CREATE TRIGGER movies_search_vector_trigger "
+            "BEFORE INSERT OR UPDATE OF name, description ON movies "
+            "FOR EACH ROW EXECUTE FUNCTION movies_search_vector_update()"
+        ),
+    ),
+    "movie_stars": (
+        DDL(
+            "CREATE TRIGGER movie_stars_search_vector_trigger "
+            "AFTER INSERT OR DELETE ON movie_stars "
+            "FOR EACH ROW EXECUTE FUNCTION movies_search_vector_touch()"
+        ),
+        # Attached here rather than to "stars", which may be created before the movie tables.
+        DDL(
+            "CREATE TRIGGER stars_search_vector_trigger "
+            "AFTER UPDATE OF name ON stars "
+            "FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name) "
+            "EXECUTE FUNCTION movies_search_vector_touch_person()"
+        ),
+    ),
+    "movie_directors": (
+        DDL(
+            "CREATE TRIGGER movie_directors_search_vector_trigger "
+            "AFTER INSERT OR DELETE ON movie_directors "
+            "FOR EACH ROW EXECUTE FUNCTION movies_search_vector_touch()"
+        ),
+        DDL(
+            "CREATE TRIGGER directors_search_vector_trigger "
+            "AFTER UPDATE OF name ON directors "
+            "FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name) "
+            "EXECUTE FUNCTION movies_search_vector_touch_person()"
+        ),
+    ),
+}
+
+for _table_name, _statements in _search_vector_ddl.items():
+    for _statement in _statements:
+        event.listen(
+            Base.metadata.tables[_table_name],
+            "after_create",
+            _statement.execute_if(dialect="postgresql")
+        )
+
+
+class movie_search_match(FunctionElement):
+    """
+    Match a plain-text search string against a movie.
+
+    PostgreSQL checks ``movies.search_vector`` with ``plainto_tsquery``; other dialects
+    (SQLite in tests) have no full-text search and fall back to a case-insensitive
+    substring match on the name and description.
+    """
+
+    type = Boolean()
+    name = "movie_search_match"
+    inherit_cache = True
+
+    def __init__(self, search):
+        super().__init__(MovieModel.search_vector, MovieModel.name, MovieModel.description, search)
+
+
+@compiles(movie_search_match, "postgresql")
+def _compile_movie_search_match_postgresql(element, compiler, **kw):
+    search_vector, _name, _description, search = element.clauses
+    return compiler.process(
+        search_vector.bool_op("@@")(func.plainto_tsquery("english", search)), **kw
+    )
+
+
+@compiles(movie_search_match)
+def _compile_movie_search_match(element, compiler, **kw):
+    _search_vector, name, description, search = element.clauses
+    return compiler.process(
+        or_(name.icontains(search), description.icontains(search)).self_group(), **kw
+    )
@@ -1,9 +1,11 @@
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
+from uuid import uuid4
 
 from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 from config import get_settings
 
@@ -11,7 +13,34 @@ settings = get_settings()
 
 POSTGRESQL_DATABASE_URL = (f"postgresql+asyncpg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}@"
                            f"{settings.POSTGRES_HOST}:{settings.POSTGRES_DB_PORT}/{settings.POSTGRES_DB}")
-postgresql_engine = create_async_engine(POSTGRESQL_DATABASE_URL, echo=False)
+
+if settings.POSTGRES_USE_PGBOUNCER:
+    # PgBouncer in transaction mode already pools server connections, so a second
+    # client-side pool would only pin them. Prepared statements must not be cached or
+    # reuse names across server connections, so both asyncpg's and SQLAlchemy's caches
+    # are disabled and every statement gets a unique name.
+    pool_options = {
+        "poolclass": NullPool,
+        "connect_args": {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        },
+    }
+else:
+    pool_options = {
+        "pool_size": settings.POSTGRES_POOL_SIZE,
+        "max_overflow": settings.POSTGRES_MAX_OVERFLOW,
+        "pool_timeout": settings.POSTGRES_POOL_TIMEOUT,
+        "pool_recycle": settings.POSTGRES_POOL_RECYCLE,
+    }
+
+postgresql_engine = create_async_engine(
+    POSTGRESQL_DATABASE_URL,
+    echo=False,
+    pool_pre_ping=True,
+    **pool_options,
+)
 AsyncPostgresqlSessionLocal = sessionmaker(  # type: ignore
     bind=postgresql_engine,
     class_=AsyncSession,
@@ -21,7 +50,7 @@ AsyncPostgresqlSessionLocal = sessionmaker(  # type: ignore
 )
 
 sync_database_url = POSTGRESQL_DATABASE_URL.replace("postgresql+asyncpg", "postgresql")
-sync_postgresql_engine = create_engine(sync_database_url, echo=False)
+sync_postgresql_engine = create_engine(sync_database_url, echo=False, pool_pre_ping=True)
 
 
 async def get_postgresql_db() -> AsyncGenerator[AsyncSession, None]:
@@ -0,0 +1,21 @@
+from typing import AsyncGenerator
+
+from redis.asyncio import Redis
+
+from config import get_settings
+
+settings = get_settings()
+
+redis_client = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+
+
+async def get_redis() -> AsyncGenerator[Redis, None]:
+    """
+    Provide the shared asynchronous Redis client.
+
+    The client keeps its own connection pool, so the same instance is handed out to every
+    request instead of opening a connection per call.
+
+    :return: An asynchronous generator yielding the Redis client.
+    """
+    yield redis_client
@@ -1,21 +1,26 @@
-from datetime import (
-    datetime,
-    timezone
-)
-
-from typing import cast
+import asyncio
+import logging
 
+from celery import Task
 from fastapi import (
     APIRouter,
     Depends,
     HTTPException,
+    Request,
     status
 )
+from redis.asyncio import Redis
+from kombu.exceptions import OperationalError as BrokerError
+from redis.exceptions import RedisError
 
 from sqlalchemy import (
     select,
-    delete
+    delete,
+    insert,
+    update,
+    func
 )
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -28,12 +33,12 @@ from config import (
 
 from database import (
     get_db,
+    get_redis,
     UserModel,
     UserGroupModel,
     UserGroupEnum,
     ActivationTokenModel,
     PasswordResetTokenModel,
-    RefreshTokenModel,
 )
 from exceptions import BaseSecurityError
 from schemas.accounts import (
@@ -49,11 +54,52 @@ from schemas.accounts import (
     RefreshTokenResponseSchema,
 )
 from security.interfaces import JWTAuthManagerInterface
-from security.dependencies import get_current_user
-from services.email import send_activation_email, send_password_reset_email
+from security.passwords import hash_password, verify_dummy_password
+from security.rate_limit import is_rate_limited
+from security.refresh_tokens import get_refresh_token_user_id, revoke_refresh_token, store_refresh_token
+from security.dependencies import CurrentUser, get_current_user, invalidate_cached_user
+from tasks.email import send_activation_email_task, send_password_reset_email_task
 
 router = APIRouter()
 
+logger = logging.getLogger(__name__)
+
+_user_group_id: int | None = None
+
+
+async def get_user_group_id(db: AsyncSession) -> int:
+    """
+    Return the id of the default USER group, caching it for the lifetime of the process.
+
+    The user groups are seeded once and never change, so only the first registration
+    needs to look the id up.
+    """
+    global _user_group_id
+    if _user_group_id is None:
+        stmt_group = (
+            select(UserGroupModel.id)
+            .where(UserGroupModel.name == UserGroupEnum.USER)
+        )
+        group_id = await db.scalar(stmt_group)
+        if group_id is None:
+            raise HTTPException(status_code=500, detail="Default user group not found.")
+        _user_group_id = group_id
+    return _user_group_id
+
+
+async def enqueue_email(task: Task, **kwargs) -> None:
+    """
+    Queue an email task without blocking the event loop.
+
+    Publishing to the broker is a synchronous network call, so it runs in a worker
+    thread. A broker outage is logged rather than failing the request: the user can
+    ask for a new email through the resend endpoints.
+    """
+    try:
+        await asyncio.to_thread(task.delay, **kwargs)
+    except BrokerError:
+        logger.exception("Could not queue %s for %s.", task.name, kwargs.get("to_email"))
+
 
 @router.post(
     "/register/",
@@ -65,46 +111,42 @@ async def register_user(
     db: AsyncSession = Depends(get_db),
 ):
     try:
-        stmt_existing = (
-            select(UserModel).
-            where(UserModel.email == user_data.email)
+        group_id = await get_user_group_id(db)
+        # Hashing (bcrypt) happens in create(); keep it off the event loop.
+        new_user = await asyncio.to_thread(
+            UserModel.create,
+            email=user_data.email,
+            raw_password=user_data.password,
+            group_id=group_id,
+        )
+
+        stmt_user = (
+            pg_insert(UserModel)
+            .values(
+                email=new_user.email,
+                hashed_password=new_user._hashed_password,
+                group_id=new_user.group_id,
+            )
+            .on_conflict_do_nothing(index_elements=[UserModel.email])
+            .returning(UserModel.id)
         )
-        res_existing = await db.execute(stmt_existing)
-        if res_existing.scalars().first():
+        user_id = await db.scalar(stmt_user)
+        if user_id is None:
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail=f"A user with this email {user_data.email} already exists.",
             )
 
-        stmt_group = (
-            select(UserGroupModel)
-            .where(UserGroupModel.name == UserGroupEnum.USER)
-        )
-        res_group = await db.execute(stmt_group)
-        user_group = res_group.scalars().first()
-        if not user_group:
-            raise HTTPException(status_code=500, detail="Default user group not found.")
-
-        new_user = UserModel.create(
-            email=user_data.email,
-            raw_password=user_data.password,
-            group_id=user_group.id,
+        stmt_token = (
+            insert(ActivationTokenModel)
+            .values(user_id=user_id)
+            .returning(ActivationTokenModel.token)
         )
-
-        db.add(new_user)
-        await db.flush()
-
-        activation = ActivationTokenModel(user_id=cast(int, new_user.id))
-        db.add(activation)
-
+        activation_token = await db.scalar(stmt_token)
         await db.commit()
-        await db.refresh(new_user)
-
-        await db.refresh(activation)
-        send_activation_email(settings=get_settings(), to_email=new_user.email, token=activation.token)
-        return new_user
 
     except HTTPException:
+        await db.rollback()
         raise
     except SQLAlchemyError:
         await db.rollback()
@@ -113,6 +155,9 @@ async def register_user(
             detail="An error occurred during user creation.",
         )
 
+    await enqueue_email(send_activation_email_task, to_email=new_user.email, token=activation_token)
+    return UserResponseSchema.model_construct(id=user_id, email=new_user.email)
+
 
 @router.post(
     "/activate/",
@@ -122,62 +167,44 @@ async def register_user(
 async def activate_user(
     payload: ActivateUserRequestSchema,
     db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
 ):
-    stmt_user = (
-        select(UserModel)
-        .where(UserModel.email == payload.email)
-    )
-    res_user = await db.execute(stmt_user)
-    user = res_user.scalars().first()
-
-    if not user:
-        raise HTTPException(
-            status_code=400,
-            detail="Invalid or expired activation token."
+    stmt_activate = (
+        update(UserModel)
+        .where(
+            UserModel.id == ActivationTokenModel.user_id,
+            UserModel.email == payload.email,
+            UserModel.is_active.is_(False),
+            ActivationTokenModel.token == payload.token,
+            ActivationTokenModel.expires_at > func.now(),
         )
-
-    if user.is_active:
-        raise HTTPException(
-            status_code=400,
-            detail="User account is already active."
-        )
-
-    stmt_token = (
-        select(ActivationTokenModel)
-        .where(ActivationTokenModel.user_id == user.id)
+        .values(is_active=True)
+        .returning(UserModel.id)
+        .execution_options(synchronize_session=False)
     )
-    res_token = await db.execute(stmt_token)
-    token_record = res_token.scalars().first()
-
-    if not token_record or token_record.token != payload.token:
-        raise HTTPException(
-            status_code=400,
-            detail="Invalid or expired activation token."
-        )
+    user_id = await db.scalar(stmt_activate)
 
-    expires_at = token_record.expires_at
-    if expires_at.tzinfo is None:
-        expires_at = expires_at.replace(tzinfo=timezone.utc)
-
-    if expires_at <= datetime.now(timezone.utc):
-        await db.execute(
-            delete(ActivationTokenModel).
-            where(ActivationTokenModel.id == token_record.id)
-        )
-        await db.commit()
+    if user_id is None:
+        await db.rollback()
+        is_active = await db.scalar(select(UserModel.is_active).where(UserModel.email == payload.email))
+        if is_active:
+            raise HTTPException(
+                status_code=400,
+                detail="User account is already active."
+            )
         raise HTTPException(
             status_code=400,
             detail="Invalid or expired activation token."
         )
 
-    user.is_active = True
     await db.execute(
         delete(ActivationTokenModel)
-        .where(ActivationTokenModel.id == token_record.id)
+        .where(ActivationTokenModel.user_id == user_id)
     )
     await db.commit()
+    await invalidate_cached_user(redis, user_id)
 
-    return {"message": "User account activated successfully."}
+    return MessageResponseSchema.model_construct(message="User account activated successfully.")
 
 
 @router.post(
@@ -189,7 +216,9 @@ async def request_password_reset_token(
     payload: PasswordResetRequestSchema,
     db: AsyncSession = Depends(get_db),
 ):
-    msg = {"message": "If you are registered, you will receive an email with instructions."}
+    msg = MessageResponseSchema.model_construct(
+        message="If you are registered, you will receive an email with instructions."
+    )
 
     stmt_user = select(UserModel).where(UserModel.email == payload.email)
     res_user = await db.execute(stmt_user)
@@ -198,19 +227,20 @@ async def request_password_reset_token(
     if not user or not user.is_active:
         return msg
 
-    await db.execute(
-        delete(PasswordResetTokenModel).where(
-            PasswordResetTokenModel.user_id == user.id)
+    stmt_token = pg_insert(PasswordResetTokenModel).values(user_id=user.id)
+    stmt_token = (
+        stmt_token.on_conflict_do_update(
+            index_elements=[PasswordResetTokenModel.user_id],
+            set_={
+                "token": stmt_token.excluded.token,
+                "expires_at": stmt_token.excluded.expires_at,
+            },
+        )
+        .returning(PasswordResetTokenModel.token)
     )
-    token_record = PasswordResetTokenModel(user_id=user.id)
-    db.add(token_record)
+    token = await db.scalar(stmt_token)
     await db.commit()
-    await db.refresh(token_record)
-    send_password_reset_email(
-        settings=get_settings(),
-        to_email=user.email,
-        token=token_record.token
-    )
+    await enqueue_email(send_password_reset_email_task, to_email=user.email, token=token)
     return msg
 
 
@@ -222,14 +252,16 @@ async def request_password_reset_token(
 async def change_password(
     payload: ChangePasswordRequestSchema,
     db: AsyncSession = Depends(get_db),
-    user: UserModel = Depends(get_current_user),
+    redis: Redis = Depends(get_redis),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
-    if not user.verify_password(payload.old_password):
+    user = await db.get(UserModel, current_user.id)
+    if not user or not user.verify_password(payload.old_password):
         raise HTTPException(status_code=400, detail="Old password is incorrect.")
     user.password = payload.new_password
-    db.add(user)
     await db.commit()
-    return {"message": "Password changed successfully."}
+    await invalidate_cached_user(redis, user.id)
+    return MessageResponseSchema.model_construct(message="Password changed successfully.")
 
 
 @router.post(
@@ -240,57 +272,50 @@ async def change_password(
 async def reset_password_complete(
     payload: PasswordResetCompleteRequestSchema,
     db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
 ):
     try:
-        stmt_user = (
-            select(UserModel)
-            .where(UserModel.email == payload.email)
+        user_id_subquery = (
+            select(UserModel.id)
+            .where(UserModel.email == payload.email, UserModel.is_active.is_(True))
+            .scalar_subquery()
         )
-        res_user = await db.execute(stmt_user)
-        user = res_user.scalars().first()
-
-        if not user or not user.is_active:
-            raise HTTPException(status_code=400, detail="Invalid email or token.")
-
         stmt_token = (
-            select(PasswordResetTokenModel)
-            .where(PasswordResetTokenModel.user_id == user.id)
-        )
-        res_token = await db.execute(stmt_token)
-        token_record = res_token.scalars().first()
-
-        if not token_record:
-            raise HTTPException(status_code=400, detail="Invalid email or token.")
-
-        if token_record.token != payload.token:
-            await db.execute(
-                delete(PasswordResetTokenModel)
-                .where(PasswordResetTokenModel.id == token_record.id)
+            delete(PasswordResetTokenModel)
+            .where(
+                PasswordResetTokenModel.user_id == user_id_subquery,
+                PasswordResetTokenModel.token == payload.token,
+                PasswordResetTokenModel.expires_at > func.now(),
             )
-            await db.commit()
-            raise HTTPException(status_code=400, detail="Invalid email or token.")
-
-        expires_at = token_record.expires_at
-        if expires_at.tzinfo is None:
-            expires_at = expires_at.replace(tzinfo=timezone.utc)
+            .returning(PasswordResetTokenModel.user_id)
+            .execution_options(synchronize_session=False)
+        )
+        user_id = await db.scalar(stmt_token)
 
-        if expires_at <= datetime.now(timezone.utc):
+        if user_id is None:
             await db.execute(
                 delete(PasswordResetTokenModel)
-                .where(PasswordResetTokenModel.id == token_record.id)
+                .where(
+                    PasswordResetTokenModel.user_id.in_(
+                        select(UserModel.id).where(UserModel.email == payload.email)
+                    )
+                )
             )
             await db.commit()
             raise HTTPException(status_code=400, detail="Invalid email or token.")
 
-        user.password = payload.password
-
+        # Only a valid token pays for the bcrypt hash, and it runs off the event loop.
+        hashed_password = await asyncio.to_thread(hash_password, payload.password)
         await db.execute(
-            delete(PasswordResetTokenModel)
-            .where(PasswordResetTokenModel.id == token_record.id)
+            update(UserModel)
+            .where(UserModel.id == user_id)
+            .values(hashed_password=hashed_password)
+            .execution_options(synchronize_session=False)
         )
         await db.commit()
+        await invalidate_cached_user(redis, user_id)
 
-        return {"message": "Password reset successfully."}
+        return MessageResponseSchema.model_construct(message="Password reset successfully.")
 
     except HTTPException:
         raise
@@ -309,15 +334,35 @@ async def reset_password_complete(
 )
 async def login_user(
     payload: LoginRequestSchema,
+    request: Request,
     db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
     jwt_manager: JWTAuthManagerInterface = Depends(get_jwt_auth_manager),
     settings: BaseAppSettings = Depends(get_settings),
 ):
+    client_ip = request.client.host if request.client else "unknown"
+    for rate_limit_key in (f"rl:login:ip:{client_ip}", f"rl:login:email:{payload.email.lower()}"):
+        if await is_rate_limited(
+            redis,
+            rate_limit_key,
+            limit=settings.LOGIN_RATE_LIMIT_ATTEMPTS,
+            window_seconds=settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts. Please try again later."
+            )
+
     stmt_user = select(UserModel).where(UserModel.email == payload.email)
     res_user = await db.execute(stmt_user)
     user = res_user.scalars().first()
 
-    if not user or not user.verify_password(payload.password):
+    if user:
+        password_valid = await asyncio.to_thread(user.verify_password, payload.password)
+    else:
+        password_valid = await asyncio.to_thread(verify_dummy_password, payload.password)
+
+    if not password_valid:
         raise HTTPException(
             status_code=401,
             detail="Invalid email or password."
@@ -333,22 +378,20 @@ async def login_user(
         access_token = jwt_manager.create_access_token({"user_id": user.id})
         refresh_token = jwt_manager.create_refresh_token({"user_id": user.id})
 
-        refresh_record = RefreshTokenModel.create(
-            user_id=user.id,
-            days_valid=settings.LOGIN_TIME_DAYS,
+        await store_refresh_token(
+            redis,
             token=refresh_token,
+            user_id=user.id,
+            ttl_seconds=settings.LOGIN_TIME_DAYS * 24 * 60 * 60,
         )
-        db.add(refresh_record)
-        await db.commit()
 
-        return {
-            "access_token": access_token,
-            "refresh_token": refresh_token,
-            "token_type": "bearer",
-        }
+        return LoginResponseSchema.model_construct(
+            access_token=access_token,
+            refresh_token=refresh_token,
+            token_type="bearer",
+        )
 
-    except SQLAlchemyError:
-        await db.rollback()
+    except RedisError:
         raise HTTPException(status_code=500, detail="An error occurred while processing the request.")
 
 
@@ -359,17 +402,16 @@ async def login_user(
 )
 async def logout_user(
     payload: LogoutRequestSchema,
-    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
     jwt_manager: JWTAuthManagerInterface = Depends(get_jwt_auth_manager),
 ):
     try:
         jwt_manager.verify_refresh_token_or_raise(payload.refresh_token)
     except BaseSecurityError:
-        return {"message": "Logged out."}
+        return MessageResponseSchema.model_construct(message="Logged out.")
 
-    await db.execute(delete(RefreshTokenModel).where(RefreshTokenModel.token == payload.refresh_token))
-    await db.commit()
-    return {"message": "Logged out."}
+    await revoke_refresh_token(redis, payload.refresh_token)
+    return MessageResponseSchema.model_construct(message="Logged out.")
 
 
 @router.post(
@@ -380,6 +422,7 @@ async def logout_user(
 async def refresh_access_token(
     payload: RefreshTokenRequestSchema,
     db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
     jwt_manager: JWTAuthManagerInterface = Depends(get_jwt_auth_manager),
 ):
     try:
@@ -387,39 +430,22 @@ async def refresh_access_token(
     except BaseSecurityError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
-    user_id = token_data.get("user_id")
-
-    stmt_rt = (
-        select(RefreshTokenModel)
-        .where(RefreshTokenModel.token == payload.refresh_token)
-    )
-    res_rt = await db.execute(stmt_rt)
-    rt_record = res_rt.scalars().first()
-    if not rt_record:
+    user_id = await get_refresh_token_user_id(redis, payload.refresh_token)
+    if user_id is None or user_id != token_data.get("user_id"):
         raise HTTPException(
             status_code=401,
-            detail="Refresh token not found."
+            detail="Refresh token not found or expired."
         )
 
-    stmt_user = select(UserModel).where(UserModel.id == user_id)
-    res_user = await db.execute(stmt_user)
-    user = res_user.scalars().first()
+    user = await db.scalar(select(UserModel).where(UserModel.id == user_id))
     if not user or not user.is_active:
         raise HTTPException(
             status_code=401,
             detail="User not found or inactive."
         )
 
-    expires_at = rt_record.expires_at
-    if expires_at.tzinfo is None:
-        expires_at = expires_at.replace(tzinfo=timezone.utc)
-
-    if expires_at <= datetime.now(timezone.utc):
-        await db.execute(delete(RefreshTokenModel).where(RefreshTokenModel.id == rt_record.id))
-        await db.commit()
-        raise HTTPException(status_code=401, detail="Refresh token expired.")
-
     access_token = jwt_manager.create_access_token({"user_id": user.id})
+    return RefreshTokenResponseSchema.model_construct(access_token=access_token)
 
 
 @router.post(
@@ -431,17 +457,27 @@ async def resend_activation_token(
     payload: ResendActivationRequestSchema,
     db: AsyncSession = Depends(get_db),
 ):
-    msg = {"message": "If the email exists and is not activated, you will receive a new activation link."}
+    msg = MessageResponseSchema.model_construct(
+        message="If the email exists and is not activated, you will receive a new activation link."
+    )
 
     res_user = await db.execute(select(UserModel).where(UserModel.email == payload.email))
     user = res_user.scalars().first()
     if not user or user.is_active:
         return msg
 
-    await db.execute(delete(ActivationTokenModel).where(ActivationTokenModel.user_id == user.id))
-    token_record = ActivationTokenModel(user_id=user.id)
-    db.add(token_record)
+    stmt_token = pg_insert(ActivationTokenModel).values(user_id=user.id)
+    stmt_token = (
+        stmt_token.on_conflict_do_update(
+            index_elements=[ActivationTokenModel.user_id],
+            set_={
+                "token": stmt_token.excluded.token,
+                "expires_at": stmt_token.excluded.expires_at,
+            },
+        )
+        .returning(ActivationTokenModel.token)
+    )
+    token = await db.scalar(stmt_token)
     await db.commit()
-    await db.refresh(token_record)
-    send_activation_email(settings=get_settings(), to_email=user.email, token=token_record.token)
+    await enqueue_email(send_activation_email_task, to_email=user.email, token=token)
     return msg
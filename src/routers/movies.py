@@ -1,36 +1,120 @@
 from typing import Optional
 
 from fastapi import APIRouter, Depends, Query, HTTPException
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func, delete, lambda_stmt
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload, selectinload
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 from math import ceil
 
 from database import get_db
 from database.models.movies import (
     MovieModel,
     GenreModel,
-    DirectorModel,
-    StarModel,
+    movie_genres,
+    movie_search_match,
     user_favorites,
 )
-from database.models.accounts import UserModel
 from schemas.movies import (
+    MOVIE_LIST_ADAPTER,
     MovieListResponseSchema,
-    MovieListItemSchema,
     MovieDetailSchema,
+    SortField,
+    movie_detail_from_orm,
 )
-from security.dependencies import get_current_user
+from security.dependencies import CurrentUser, get_current_user
 
 
 router = APIRouter(prefix="/movies", tags=["Movies"])
 
+_SORT_COLUMNS = {
+    SortField.year: MovieModel.year,
+    SortField.price: MovieModel.price,
+    SortField.imdb: MovieModel.imdb,
+    SortField.votes: MovieModel.votes,
+}
+
+
+def _build_movie_query(
+    user_id: Optional[int],
+    year: Optional[int],
+    min_imdb: Optional[float],
+    max_price: Optional[float],
+    search: Optional[str],
+    sort_by: SortField,
+) -> StatementLambdaElement:
+    """
+    Build the filtered and sorted movie list query shared by the list endpoints.
+
+    The statement is assembled from lambdas so SQLAlchemy caches the compiled SQL per
+    combination of filters; the filter values themselves are extracted as bound parameters.
+    Every row carries the total number of matches in its ``total`` column.
+    """
+    stmt = lambda_stmt(
+        lambda: select(MovieModel, func.count().over().label("total")).options(raiseload("*"))
+    )
+
+    if user_id is not None:
+        stmt += lambda s: (
+            s.join(user_favorites, user_favorites.c.movie_id == MovieModel.id)
+            .where(user_favorites.c.user_id == user_id)
+        )
+
+    if year:
+        stmt += lambda s: s.where(MovieModel.year == year)
+
+    if min_imdb:
+        stmt += lambda s: s.where(MovieModel.imdb >= min_imdb)
+
+    if max_price:
+        stmt += lambda s: s.where(MovieModel.price <= max_price)
+
+    if search:
+        stmt += lambda s: s.where(movie_search_match(search))
+
+    sort_column = _SORT_COLUMNS[sort_by]
+    stmt += lambda s: s.order_by(sort_column.desc())
+    return stmt
+
+
+async def _paginate_movies(
+    db: AsyncSession,
+    stmt: StatementLambdaElement,
+    page: int,
+    size: int,
+) -> MovieListResponseSchema:
+    offset = (page - 1) * size
+    res = await db.execute(stmt + (lambda s: s.offset(offset).limit(size)))
+    rows = res.all()
+
+    if rows:
+        total = rows[0].total
+    elif page > 1:
+        first_row = (await db.execute(stmt + (lambda s: s.limit(1)))).first()
+        total = first_row.total if first_row else 0
+    else:
+        total = 0
+
+    return MovieListResponseSchema(
+        items=MOVIE_LIST_ADAPTER.validate_python([row[0] for row in rows], from_attributes=True),
+        total=total,
+        page=page,
+        pages=ceil(total / size) if total else 1,
+    )
+
 
 @router.get("/genres/")
 async def list_genres_with_counts(db: AsyncSession = Depends(get_db)):
+    movies_count = (
+        select(func.count())
+        .select_from(movie_genres)
+        .where(movie_genres.c.genre_id == GenreModel.id)
+        .scalar_subquery()
+    )
     stmt = (
-        select(GenreModel.id, GenreModel.name, func.count(MovieModel.id).label("movies_count"))
-        .join(GenreModel.movies, isouter=True)
-        .group_by(GenreModel.id)
+        select(GenreModel.id, GenreModel.name, movies_count.label("movies_count"))
         .order_by(GenreModel.name.asc())
     )
     res = await db.execute(stmt)
@@ -47,64 +131,33 @@ async def get_movies(
     max_price: Optional[float] = None,
     search: Optional[str] = None,
 
-    sort_by: str = Query("year", pattern="^(year|price|imdb|votes)$"),
+    sort_by: SortField = SortField.year,
 
     db: AsyncSession = Depends(get_db),
 ):
-    stmt = select(MovieModel)
-
-    if year:
-        stmt = stmt.where(MovieModel.year == year)
-
-    if min_imdb:
-        stmt = stmt.where(MovieModel.imdb >= min_imdb)
-
-    if max_price:
-        stmt = stmt.where(MovieModel.price <= max_price)
-
-    if search:
-        search_term = f"%{search.lower()}%"
-        stmt = (
-            stmt.join(MovieModel.stars, isouter=True)
-            .join(MovieModel.directors, isouter=True)
-            .where(
-                or_(
-                    func.lower(MovieModel.name).like(search_term),
-                    func.lower(MovieModel.description).like(search_term),
-                    func.lower(StarModel.name).like(search_term),
-                    func.lower(DirectorModel.name).like(search_term),
-                )
-            )
-            .distinct()
-        )
-
-    sort_column = getattr(MovieModel, sort_by)
-    stmt = stmt.order_by(sort_column.desc())
-
-    total = await db.scalar(select(func.count()).select_from(stmt.subquery()))
-    pages = ceil(total / size) if total else 1
-
-    stmt = stmt.offset((page - 1) * size).limit(size)
-
-    res = await db.execute(stmt)
-    movies = res.scalars().all()
-
-    return MovieListResponseSchema(
-        items=[MovieListItemSchema.model_validate(m) for m in movies],
-        total=total,
-        page=page,
-        pages=pages,
-    )
+    stmt = _build_movie_query(None, year, min_imdb, max_price, search, sort_by)
+    return await _paginate_movies(db, stmt, page, size)
 
 
 @router.get("/{movie_id}/", response_model=MovieDetailSchema)
 async def get_movie(movie_id: int, db: AsyncSession = Depends(get_db)):
-    movie = await db.get(MovieModel, movie_id)
+    stmt = (
+        select(MovieModel)
+        .options(
+            selectinload(MovieModel.genres),
+            selectinload(MovieModel.directors),
+            selectinload(MovieModel.stars),
+            joinedload(MovieModel.certification),
+            raiseload("*"),
+        )
+        .where(MovieModel.id == movie_id)
+    )
+    movie = await db.scalar(stmt)
 
     if not movie:
         raise HTTPException(404, "Movie not found")
 
-    return MovieDetailSchema.model_validate(movie)
+    return movie_detail_from_orm(movie)
 
 
 @router.get("/favorites/", response_model=MovieListResponseSchema)
@@ -115,72 +168,32 @@ async def get_favorite_movies(
     min_imdb: Optional[float] = Query(None, ge=0, le=10),
     max_price: Optional[float] = None,
     search: Optional[str] = None,
-    sort_by: str = Query("year", pattern="^(year|price|imdb|votes)$"),
+    sort_by: SortField = SortField.year,
     db: AsyncSession = Depends(get_db),
-    user: UserModel = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ):
-    stmt = (
-        select(MovieModel)
-        .join(user_favorites, user_favorites.c.movie_id == MovieModel.id)
-        .where(user_favorites.c.user_id == user.id)
-    )
-
-    if year:
-        stmt = stmt.where(MovieModel.year == year)
-    if min_imdb:
-        stmt = stmt.where(MovieModel.imdb >= min_imdb)
-    if max_price:
-        stmt = stmt.where(MovieModel.price <= max_price)
-
-    if search:
-        search_term = f"%{search.lower()}%"
-        stmt = (
-            stmt.join(MovieModel.stars, isouter=True)
-            .join(MovieModel.directors, isouter=True)
-            .where(
-                or_(
-                    func.lower(MovieModel.name).like(search_term),
-                    func.lower(MovieModel.description).like(search_term),
-                    func.lower(StarModel.name).like(search_term),
-                    func.lower(DirectorModel.name).like(search_term),
-                )
-            )
-            .distinct()
-        )
-
-    sort_column = getattr(MovieModel, sort_by)
-    stmt = stmt.order_by(sort_column.desc())
-
-    total = await db.scalar(select(func.count()).select_from(stmt.subquery()))
-    pages = ceil(total / size) if total else 1
-    stmt = stmt.offset((page - 1) * size).limit(size)
-
-    res = await db.execute(stmt)
-    movies = res.scalars().all()
-
-    return MovieListResponseSchema(
-        items=[MovieListItemSchema.model_validate(m) for m in movies],
-        total=total,
-        page=page,
-        pages=pages,
-    )
+    stmt = _build_movie_query(user.id, year, min_imdb, max_price, search, sort_by)
+    return await _paginate_movies(db, stmt, page, size)
 
 
 @router.post("/{movie_id}/favorite/")
 async def add_to_favorites(
     movie_id: int,
     db: AsyncSession = Depends(get_db),
-    user: UserModel = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ):
-    movie = await db.get(MovieModel, movie_id)
-    if not movie:
+    stmt = (
+        pg_insert(user_favorites)
+        .values(user_id=user.id, movie_id=movie_id)
+        .on_conflict_do_nothing()
+    )
+    try:
+        await db.execute(stmt)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
         raise HTTPException(404, "Movie not found")
 
-    await db.refresh(user)
-    if movie not in user.favorites:
-        user.favorites.append(movie)
-
-    await db.commit()
     return {"message": "Added to favorites"}
 
 
@@ -188,15 +201,21 @@ async def add_to_favorites(
 async def remove_from_favorites(
     movie_id: int,
     db: AsyncSession = Depends(get_db),
-    user: UserModel = Depends(get_current_user),
+    user: CurrentUser = Depends(get_current_user),
 ):
-    movie = await db.get(MovieModel, movie_id)
-    if not movie:
-        raise HTTPException(404, "Movie not found")
+    stmt = (
+        delete(user_favorites)
+        .where(
+            user_favorites.c.user_id == user.id,
+            user_favorites.c.movie_id == movie_id,
+        )
+    )
+    res = await db.execute(stmt)
+    await db.commit()
 
-    await db.refresh(user)
-    if movie in user.favorites:
-        user.favorites.remove(movie)
-        await db.commit()
+    if not res.rowcount:
+        movie_exists = await db.scalar(select(MovieModel.id).where(MovieModel.id == movie_id))
+        if not movie_exists:
+            raise HTTPException(404, "Movie not found")
 
     return {"message": "Removed from favorites"}
\ No newline at end of file
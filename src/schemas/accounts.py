@@ -7,6 +7,11 @@ class UserRegistrationRequestSchema(BaseModel):
     email: EmailStr
     password: str
 
+    @field_validator("email")
+    @classmethod
+    def normalize_email(cls, value: str) -> str:
+        return value.strip().lower()
+
     @field_validator("password")
     @classmethod
     def validate_password(cls, value: str) -> str:
@@ -1,45 +1,50 @@
+import enum
 import uuid
-from typing import Optional, List
-from pydantic import BaseModel, Field, field_validator
+from datetime import datetime
+from typing import List
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 
 
-class GenreSchema(BaseModel):
-    id: int
-    name: str
-
+class OrmBase(BaseModel):
     model_config = {"from_attributes": True}
 
 
-class StarSchema(BaseModel):
+class SortField(str, enum.Enum):
+    year = "year"
+    price = "price"
+    imdb = "imdb"
+    votes = "votes"
+
+
+class GenreSchema(OrmBase):
     id: int
     name: str
 
-    model_config = {"from_attributes": True}
 
-
-class DirectorSchema(BaseModel):
+class StarSchema(OrmBase):
     id: int
     name: str
 
-    model_config = {"from_attributes": True}
-
 
-class CertificationSchema(BaseModel):
+class DirectorSchema(OrmBase):
     id: int
     name: str
 
-    model_config = {"from_attributes": True}
+
+class CertificationSchema(OrmBase):
+    id: int
+    name: str
 
 
-class MovieBaseSchema(BaseModel):
+class MovieBaseSchema(OrmBase):
     name: str = Field(..., max_length=255)
     year: int = Field(..., ge=1888)
     time: int = Field(..., gt=0)
     imdb: float = Field(..., ge=0, le=10)
     votes: int = Field(..., ge=0)
 
-    meta_score: Optional[float] = Field(None, ge=0, le=100)
-    gross: Optional[float] = Field(None, ge=0)
+    meta_score: float | None = Field(None, ge=0, le=100)
+    gross: float | None = Field(None, ge=0)
 
     description: str
     price: float = Field(..., ge=0)
@@ -49,14 +54,11 @@ class MovieBaseSchema(BaseModel):
     @field_validator("year")
     @classmethod
     def validate_year(cls, value: int):
-        from datetime import datetime
         current_year = datetime.now().year
         if value > current_year + 1:
             raise ValueError("Invalid release year")
         return value
 
-    model_config = {"from_attributes": True}
-
 
 class MovieCreateSchema(MovieBaseSchema):
     genres: List[int]
@@ -64,27 +66,25 @@ class MovieCreateSchema(MovieBaseSchema):
     stars: List[int]
 
 
-class MovieUpdateSchema(BaseModel):
-    name: Optional[str] = None
-    year: Optional[int] = Field(None, ge=1888)
-    time: Optional[int] = Field(None, gt=0)
-    imdb: Optional[float] = Field(None, ge=0, le=10)
-    votes: Optional[int] = Field(None, ge=0)
-
-    meta_score: Optional[float] = Field(None, ge=0, le=100)
-    gross: Optional[float] = Field(None, ge=0)
-    description: Optional[str] = None
-    price: Optional[float] = Field(None, ge=0)
+class MovieUpdateSchema(OrmBase):
+    name: str | None = None
+    year: int | None = Field(None, ge=1888)
+    time: int | None = Field(None, gt=0)
+    imdb: float | None = Field(None, ge=0, le=10)
+    votes: int | None = Field(None, ge=0)
 
-    certification_id: Optional[int] = None
-    genres: Optional[List[int]] = None
-    directors: Optional[List[int]] = None
-    stars: Optional[List[int]] = None
+    meta_score: float | None = Field(None, ge=0, le=100)
+    gross: float | None = Field(None, ge=0)
+    description: str | None = None
+    price: float | None = Field(None, ge=0)
 
-    model_config = {"from_attributes": True}
+    certification_id: int | None = None
+    genres: List[int] | None = None
+    directors: List[int] | None = None
+    stars: List[int] | None = None
 
 
-class MovieListItemSchema(BaseModel):
+class MovieListItemSchema(OrmBase):
     id: int
     uuid: uuid.UUID
     name: str
@@ -92,10 +92,11 @@ class MovieListItemSchema(BaseModel):
     imdb: float
     price: float
 
-    model_config = {"from_attributes": True}
+
+MOVIE_LIST_ADAPTER = TypeAdapter(List[MovieListItemSchema])
 
 
-class MovieDetailSchema(BaseModel):
+class MovieDetailSchema(OrmBase):
     id: int
     uuid: uuid.UUID
 
@@ -104,8 +105,8 @@ class MovieDetailSchema(BaseModel):
     time: int
     imdb: float
     votes: int
-    meta_score: Optional[float]
-    gross: Optional[float]
+    meta_score: float | None
+    gross: float | None
 
     description: str
     price: float
@@ -115,13 +116,38 @@ class MovieDetailSchema(BaseModel):
     directors: List[DirectorSchema]
     stars: List[StarSchema]
 
-    model_config = {"from_attributes": True}
 
-
-class MovieListResponseSchema(BaseModel):
+def movie_detail_from_orm(movie) -> MovieDetailSchema:
+    """
+    Build a MovieDetailSchema from a loaded MovieModel without re-validating it.
+
+    The values come straight from the database, which already enforces the schema's
+    constraints; the movie must have its certification, genres, directors and stars loaded.
+    """
+    certification = movie.certification
+    return MovieDetailSchema.model_construct(
+        id=movie.id,
+        uuid=movie.uuid,
+        name=movie.name,
+        year=movie.year,
+        time=movie.time,
+        imdb=movie.imdb,
+        votes=movie.votes,
+        meta_score=movie.meta_score,
+        gross=movie.gross,
+        description=movie.description,
+        price=movie.price,
+        certification=CertificationSchema.model_construct(
+            id=certification.id, name=certification.name
+        ),
+        genres=[GenreSchema.model_construct(id=g.id, name=g.name) for g in movie.genres],
+        directors=[DirectorSchema.model_construct(id=d.id, name=d.name) for d in movie.directors],
+        stars=[StarSchema.model_construct(id=s.id, name=s.name) for s in movie.stars],
+    )
+
+
+class MovieListResponseSchema(OrmBase):
     items: List[MovieListItemSchema]
     total: int
     page: int
     pages: int
-
-    model_config = {"from_attributes": True}
\ No newline at end of file
@@ -1,19 +1,221 @@
-from fastapi import Depends, HTTPException, status
+import base64
+import binascii
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+
+from cachetools import TLRUCache, TTLCache
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from security.http import get_token
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from database import get_db
+from config import get_jwt_auth_manager
+from database import get_db, get_redis
 from database.models.accounts import UserModel
+from exceptions import BaseSecurityError
+from security.interfaces import JWTAuthManagerInterface
+
+USER_CACHE_TTL_SECONDS = 60
+LOCAL_USER_CACHE_TTL_SECONDS = 30
+LOCAL_USER_CACHE_MAXSIZE = 50_000
+TOKEN_CACHE_TTL_SECONDS = 5
+TOKEN_CACHE_MAXSIZE = 10_000
+
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials.",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+
+@dataclass(frozen=True, slots=True)
+class CurrentUser:
+    """
+    The authenticated user as resolved by get_current_user.
+
+    Holds only what authorization needs; endpoints that need anything else (e.g. the
+    password hash) must load the UserModel themselves.
+    """
+
+    id: int
+    is_active: bool
+    group_id: int
+
+
+class _BearerToken(OAuth2PasswordBearer):
+    """
+    OAuth2 password-flow bearer scheme with a minimal header parser.
+
+    Subclassing keeps the security scheme in the OpenAPI docs; the call itself only
+    slices the Authorization header.
+    """
+
+    async def __call__(self, request: Request) -> str:
+        authorization = request.headers.get("authorization") or ""
+        if authorization[:7].lower() != "bearer " or len(authorization) == 7:
+            raise credentials_exception
+        return authorization[7:]
+
+
+bearer_token = _BearerToken(tokenUrl="/auth/login", scheme_name="OAuth2PasswordBearer")
+
+
+def _token_cache_ttu(_key: bytes, value: tuple[int, float], now: float) -> float:
+    # Never keep a token past its own expiry.
+    return min(now + TOKEN_CACHE_TTL_SECONDS, value[1])
+
+
+_token_cache: TLRUCache = TLRUCache(maxsize=TOKEN_CACHE_MAXSIZE, ttu=_token_cache_ttu, timer=time.time)
+_token_cache_lock = threading.Lock()
+
+# user_id -> CurrentUser, in front of the shared Redis cache.
+_local_user_cache: TTLCache = TTLCache(
+    maxsize=LOCAL_USER_CACHE_MAXSIZE, ttl=LOCAL_USER_CACHE_TTL_SECONDS
+)
+_local_user_cache_lock = threading.Lock()
+
+
+def _is_well_formed_jwt(token: str) -> bool:
+    """
+    Cheap structural check run before the signature is verified: three dot-separated
+    segments and a base64url-decodable header.
+    """
+    parts = token.split(".", 2)
+    if len(parts) != 3 or "." in parts[2]:
+        return False
+    try:
+        header = parts[0]
+        base64.b64decode(header + "=" * (-len(header) % 4), altchars=b"-_", validate=True)
+    except (binascii.Error, ValueError):
+        return False
+    return True
+
+
+def _decode_user_id(token: str, jwt_manager: JWTAuthManagerInterface) -> int:
+    """
+    Return the user id carried by a valid access token.
+
+    Successfully decoded tokens are remembered for a few seconds (never past their "exp"),
+    keyed by the token's SHA-256 digest, so bursts of requests with the same token skip
+    the signature check. Failures are never cached.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    with _token_cache_lock:
+        cached = _token_cache.get(key)
+    if cached is not None:
+        return cached[0]
+
+    if not _is_well_formed_jwt(token):
+        raise credentials_exception
+
+    try:
+        payload = jwt_manager.decode_access_token(token)
+    except BaseSecurityError:
+        raise credentials_exception
+
+    try:
+        user_id = int(payload["user_id"])
+    except (KeyError, TypeError, ValueError):
+        raise credentials_exception
+
+    expires_at = payload.get("exp")
+    if expires_at is not None:
+        with _token_cache_lock:
+            _token_cache[key] = (user_id, float(expires_at))
+    return user_id
+
+
+def _user_cache_key(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+async def _get_cached_user(redis: Redis, user_id: int) -> CurrentUser | None:
+    with _local_user_cache_lock:
+        user = _local_user_cache.get(user_id)
+    if user is not None:
+        return user
+
+    try:
+        cached = await redis.hgetall(_user_cache_key(user_id))
+    except RedisError:
+        return None
+    if not cached:
+        return None
+
+    user = CurrentUser(
+        id=user_id, is_active=cached["is_active"] == "1", group_id=int(cached["group_id"])
+    )
+    with _local_user_cache_lock:
+        _local_user_cache[user_id] = user
+    return user
+
+
+async def _cache_user(redis: Redis, user: CurrentUser) -> None:
+    with _local_user_cache_lock:
+        _local_user_cache[user.id] = user
+
+    key = _user_cache_key(user.id)
+    try:
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={"is_active": int(user.is_active), "group_id": user.group_id})
+            pipe.expire(key, USER_CACHE_TTL_SECONDS)
+            await pipe.execute()
+    except RedisError:
+        pass
+
+
+async def invalidate_cached_user(redis: Redis, user_id: int) -> None:
+    """
+    Drop the cached authentication record of a user.
+
+    Call this whenever a field kept in the cache (activation state, group) or the user's
+    credentials change, so the next request reloads the user from the database. Only this
+    process's in-memory copy is dropped; other workers pick up the change once their
+    entry expires (LOCAL_USER_CACHE_TTL_SECONDS).
+    """
+    with _local_user_cache_lock:
+        _local_user_cache.pop(user_id, None)
+    try:
+        await redis.delete(_user_cache_key(user_id))
+    except RedisError:
+        pass
+
+
+async def get_current_user(
+    token: str = Depends(bearer_token),
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
+    jwt_manager: JWTAuthManagerInterface = Depends(get_jwt_auth_manager),
+) -> CurrentUser:
+    """
+    Resolve the active user from the bearer access token.
 
-SECRET_KEY = "YOUR_SECRET_KEY"
-ALGORITHM = "HS256"
+    The minimal record needed to authorize a request (id, is_active, group_id) is cached
+    in process memory and in Redis for a short time, so most authenticated requests do
+    not hit the database; on a miss only those columns are selected.
+    """
+    user_id = _decode_user_id(token, jwt_manager)
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+    user = await _get_cached_user(redis, user_id)
+    if user is None:
+        row = (
+            await db.execute(
+                select(UserModel.is_active, UserModel.group_id).where(UserModel.id == user_id)
+            )
+        ).first()
+        if row is None:
+            raise credentials_exception
+        user = CurrentUser(id=user_id, is_active=row.is_active, group_id=row.group_id)
+        await _cache_user(redis, user)
 
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User account is not activated."
+        )
 
-def get_current_user(
-        db: Annotated[str, Depends(get_db)],
-        access_token: Annotated[str, Depends(get_token)],
-        jwt_manager: Annotated[str, Depends(get_jwt_auth_manager)],
-) -> UserModel:
-    try:
\ No newline at end of file
+    return user
@@ -6,6 +6,10 @@ pwd_context = CryptContext(
     deprecated="auto"
 )
 
+# A bcrypt hash with the same cost factor as real ones, checked when no user matches
+# a login so that unknown emails take as long to reject as wrong passwords.
+_DUMMY_PASSWORD_HASH = "$2b$14$/It7Nvf//7OJ5kwCegzdFOz/qG5MCN1Td9oGVMI6cmx8fPK0GdzfC"
+
 
 def hash_password(password: str) -> str:
     """
@@ -38,3 +42,21 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         bool: True if the password is correct, False otherwise.
     """
     return pwd_context.verify(plain_password, hashed_password)
+
+
+
+def verify_dummy_password(plain_password: str) -> bool:
+    """
+    Run a full password verification against a fixed hash that matches no real password.
+
+    This is used when the account being logged into does not exist, so the response
+    time does not reveal whether the email is registered.
+
+    Args:
+        plain_password (str): The plain-text password provided by the user.
+
+    Returns:
+        bool: Always False.
+    """
+    pwd_context.verify(plain_password, _DUMMY_PASSWORD_HASH)
+    return False
\ No newline at end of file
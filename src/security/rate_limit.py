@@ -0,0 +1,28 @@
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+
+async def is_rate_limited(redis: Redis, key: str, limit: int, window_seconds: int) -> bool:
+    """
+    Count a hit against a fixed-window counter and report whether the limit is exceeded.
+
+    The counter lives in Redis under the given key and expires `window_seconds` after the
+    first hit of the window. If Redis is unavailable, the request is let through.
+
+    Args:
+        redis (Redis): The Redis client holding the counters.
+        key (str): The counter key, e.g. "rl:login:ip:127.0.0.1".
+        limit (int): The number of hits allowed per window.
+        window_seconds (int): The window length in seconds.
+
+    Returns:
+        bool: True if this hit exceeds the limit, False otherwise.
+    """
+    try:
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, window_seconds, nx=True)
+            hits, _ = await pipe.execute()
+    except RedisError:
+        return False
+    return hits > limit
@@ -0,0 +1,51 @@
+import hashlib
+
+from redis.asyncio import Redis
+
+
+def _refresh_token_key(token: str) -> str:
+    """
+    Build the Redis key for a refresh token.
+
+    Only a SHA-256 digest of the token is stored, so a dump of Redis does not leak usable tokens.
+    """
+    return f"rt:{hashlib.sha256(token.encode()).hexdigest()}"
+
+
+async def store_refresh_token(redis: Redis, token: str, user_id: int, ttl_seconds: int) -> None:
+    """
+    Remember an issued refresh token; Redis drops it on its own once the TTL runs out.
+
+    Args:
+        redis (Redis): The Redis client.
+        token (str): The encoded refresh token.
+        user_id (int): The id of the user the token was issued to.
+        ttl_seconds (int): How long the token stays valid, in seconds.
+    """
+    await redis.setex(_refresh_token_key(token), ttl_seconds, user_id)
+
+
+async def get_refresh_token_user_id(redis: Redis, token: str) -> int | None:
+    """
+    Look up the owner of a refresh token.
+
+    Args:
+        redis (Redis): The Redis client.
+        token (str): The encoded refresh token.
+
+    Returns:
+        int | None: The user id, or None if the token was revoked or has expired.
+    """
+    user_id = await redis.get(_refresh_token_key(token))
+    return int(user_id) if user_id is not None else None
+
+
+async def revoke_refresh_token(redis: Redis, token: str) -> None:
+    """
+    Forget a refresh token so it can no longer be exchanged for access tokens.
+
+    Args:
+        redis (Redis): The Redis client.
+        token (str): The encoded refresh token.
+    """
+    await redis.delete(_refresh_token_key(token))
@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from jose import jwt, JWTError, ExpiredSignatureError
+import jwt
 
 from exceptions import TokenExpiredError, InvalidTokenError
 from security.interfaces import JWTAuthManagerInterface
@@ -56,9 +56,9 @@ class JWTAuthManager(JWTAuthManagerInterface):
         """
         try:
             return jwt.decode(token, self._secret_key_access, algorithms=[self._algorithm])
-        except ExpiredSignatureError:
+        except jwt.ExpiredSignatureError:
             raise TokenExpiredError
-        except JWTError:
+        except jwt.InvalidTokenError:
             raise InvalidTokenError
 
     def decode_refresh_token(self, token: str) -> dict:
@@ -67,10 +67,9 @@ class JWTAuthManager(JWTAuthManagerInterface):
         """
         try:
             return jwt.decode(token, self._secret_key_refresh, algorithms=[self._algorithm])
-        except ExpiredSignatureError:
+        except jwt.ExpiredSignatureError:
             raise TokenExpiredError
-        except JWTError as error:
-            print(error)
+        except jwt.InvalidTokenError:
             raise InvalidTokenError
 
     def verify_refresh_token_or_raise(self, token: str) -> None:
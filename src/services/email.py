@@ -1,8 +1,70 @@
+import atexit
 import smtplib
+import threading
 from email.message import EmailMessage
+from functools import lru_cache
+from urllib.parse import urlencode
 
 from config import BaseAppSettings
 
+_thread_local = threading.local()
+_open_servers: set[smtplib.SMTP] = set()
+_open_servers_lock = threading.Lock()
+
+
+def _connect(settings: BaseAppSettings) -> smtplib.SMTP:
+    server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT)
+    try:
+        if settings.SMTP_USE_TLS:
+            server.starttls()
+        if settings.SMTP_USERNAME:
+            server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
+    except Exception:
+        server.close()
+        raise
+    with _open_servers_lock:
+        _open_servers.add(server)
+    return server
+
+
+def _close(server: smtplib.SMTP) -> None:
+    with _open_servers_lock:
+        _open_servers.discard(server)
+    try:
+        server.quit()
+    except (smtplib.SMTPException, OSError):
+        server.close()
+
+
+def _get_server(settings: BaseAppSettings) -> smtplib.SMTP:
+    """
+    Return this thread's SMTP connection, reconnecting if the server dropped it.
+
+    Connections are kept open between messages so the handshake (and STARTTLS/AUTH)
+    is paid once per worker thread rather than once per email.
+    """
+    server = getattr(_thread_local, "server", None)
+    if server is not None:
+        try:
+            if server.noop()[0] == 250:
+                return server
+        except (smtplib.SMTPException, OSError):
+            pass
+        _close(server)
+        _thread_local.server = None
+
+    server = _connect(settings)
+    _thread_local.server = server
+    return server
+
+
+@atexit.register
+def _close_all_servers() -> None:
+    with _open_servers_lock:
+        servers = list(_open_servers)
+    for server in servers:
+        _close(server)
+
 
 def send_email(settings: BaseAppSettings, to_email: str, subject: str, body: str) -> None:
     if not getattr(settings, "SMTP_HOST", None):
@@ -14,19 +76,30 @@ def send_email(settings: BaseAppSettings, to_email: str, subject: str, body: str
     msg["To"] = to_email
     msg.set_content(body)
 
-    with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-        if settings.SMTP_USE_TLS:
-            server.starttls()
-        if settings.SMTP_USERNAME:
-            server.login(settings.SMTP_USERNAME, settings.SMTP_PASSWORD)
+    server = _get_server(settings)
+    try:
         server.send_message(msg)
+    except smtplib.SMTPServerDisconnected:
+        _close(server)
+        _thread_local.server = None
+        _get_server(settings).send_message(msg)
+
+
+@lru_cache(maxsize=8)
+def _frontend_base(frontend_url: str) -> str:
+    return frontend_url.rstrip("/")
+
+
+def _frontend_link(settings: BaseAppSettings, path: str, to_email: str, token: str) -> str:
+    query = urlencode({"email": to_email, "token": token})
+    return f"{_frontend_base(settings.FRONTEND_URL)}/{path}?{query}"
 
 
 def send_activation_email(settings: BaseAppSettings, to_email: str, token: str) -> None:
-    link = f"{settings.FRONTEND_URL.rstrip('/')}/activate?email={to_email}&token={token}"
+    link = _frontend_link(settings, "activate", to_email, token)
     send_email(settings, to_email, "Activate your account", f"Activation link: {link}")
 
 
 def send_password_reset_email(settings: BaseAppSettings, to_email: str, token: str) -> None:
-    link = f"{settings.FRONTEND_URL.rstrip('/')}/reset-password?email={to_email}&token={token}"
-    send_email(settings, to_email, "Reset your password", f"Password reset link: {link}")
\ No newline at end of file
+    link = _frontend_link(settings, "reset-password", to_email, token)
+    send_email(settings, to_email, "Reset your password", f"Password reset link: {link}")
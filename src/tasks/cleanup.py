@@ -1,20 +1,57 @@
+import time
 from datetime import datetime, timezone
 
 from celery_app import celery_app
 from database.session_postgresql import sync_postgresql_engine
-from sqlalchemy import delete
-from sqlalchemy.orm import Session
+from sqlalchemy import Table, delete, func, select
 
-from database.models.accounts import ActivationTokenModel, PasswordResetTokenModel, RefreshTokenModel
+from database.models.accounts import ActivationTokenModel, PasswordResetTokenModel
+
+CLEANUP_BATCH_SIZE = 1000
+CLEANUP_BATCH_PAUSE_SECONDS = 0.05
+
+
+def _delete_expired_batch(table: Table, now: datetime):
+    expired_ids = (
+        select(table.c.id)
+        .where(table.c.expires_at <= now)
+        .limit(CLEANUP_BATCH_SIZE)
+        .scalar_subquery()
+    )
+    return delete(table).where(table.c.id.in_(expired_ids))
 
 
 @celery_app.task(name="tasks.cleanup.cleanup_expired_tokens")
 def cleanup_expired_tokens() -> int:
+    """
+    Delete expired activation and password reset tokens.
+
+    Rows are removed in batches of CLEANUP_BATCH_SIZE, each in its own short transaction,
+    so a large backlog never holds locks or piles up WAL in a single statement. The token
+    tables are leaves, so the deletes are issued as plain Core statements on a connection
+    without going through an ORM session.
+
+    Each round deletes a batch from every token table in one statement (PostgreSQL
+    data-modifying CTEs), so a run with nothing to clean costs a single round-trip.
+    """
     now = datetime.now(timezone.utc)
-    with Session(sync_postgresql_engine) as session:
-        total = 0
-        for model in (ActivationTokenModel, PasswordResetTokenModel, RefreshTokenModel):
-            res = session.execute(delete(model).where(model.expires_at <= now))
-            total += res.rowcount or 0
-        session.commit()
-        return total
\ No newline at end of file
+    tables = [model.__table__ for model in (ActivationTokenModel, PasswordResetTokenModel)]
+
+    deleted_ctes = [
+        _delete_expired_batch(table, now).returning(table.c.id).cte(f"deleted_{table.name}")
+        for table in tables
+    ]
+    stmt = select(
+        *(select(func.count()).select_from(cte).scalar_subquery() for cte in deleted_ctes)
+    )
+
+    total = 0
+    while True:
+        with sync_postgresql_engine.begin() as connection:
+            counts = connection.execute(stmt).one()
+        total += sum(counts)
+        if max(counts) < CLEANUP_BATCH_SIZE:
+            break
+        time.sleep(CLEANUP_BATCH_PAUSE_SECONDS)
+    return total
+
@@ -0,0 +1,45 @@
+import smtplib
+from typing import Callable
+
+from celery import Task
+
+from celery_app import celery_app
+from config import get_settings
+from services.email import send_activation_email, send_password_reset_email
+
+_RETRY_OPTIONS = {"bind": True, "max_retries": 5, "default_retry_delay": 30}
+
+
+def _is_transient(exc: Exception) -> bool:
+    """
+    Whether a failed send is worth retrying: dropped connections and 4xx replies.
+
+    Permanent failures (5xx replies, including on connect, refused recipients, bad
+    credentials) are not retried.
+    """
+    if isinstance(exc, smtplib.SMTPServerDisconnected):
+        return True
+    # Also covers SMTPConnectError and SMTPAuthenticationError.
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    # SMTPException subclasses OSError; only plain socket errors are left here.
+    return isinstance(exc, OSError) and not isinstance(exc, smtplib.SMTPException)
+
+
+def _send_or_retry(task: Task, send: Callable[..., None], **kwargs) -> None:
+    try:
+        send(settings=get_settings(), **kwargs)
+    except (smtplib.SMTPException, OSError) as exc:
+        if not _is_transient(exc):
+            raise
+        raise task.retry(exc=exc)
+
+
+@celery_app.task(name="tasks.email.send_activation_email", **_RETRY_OPTIONS)
+def send_activation_email_task(self, to_email: str, token: str) -> None:
+    _send_or_retry(self, send_activation_email, to_email=to_email, token=token)
+
+
+@celery_app.task(name="tasks.email.send_password_reset_email", **_RETRY_OPTIONS)
+def send_password_reset_email_task(self, to_email: str, token: str) -> None:
+    _send_or_retry(self, send_password_reset_email, to_email=to_email, token=token)